@@ -1,12 +1,10 @@
-import os
 import argparse
-import json
 import pandas as pd
 import time
 import random
 import requests
 from datetime import datetime
-import sys
+from tqdm.auto import tqdm
 
 class TikTokAPI:
     """Simple TikTok API wrapper using the unofficial TikTok API endpoints"""
@@ -107,7 +105,7 @@ def search_influencers_by_keyword(api, keyword, max_results=100):
     offset = 0
     batch_size = 30  # TikTok API typically returns 30 results per page
     
-    with st.spinner(f"Finding {keyword} creators..."):
+    with tqdm(total=max_results, desc=f"Finding {keyword} creators") as pbar:
         while len(all_users) < max_results:
             users = api.search_users(keyword, count=batch_size, offset=offset)
             
@@ -132,7 +130,7 @@ def filter_influencers(api, users, max_followers=550000, min_avg_views=40000, ni
     """Filter influencers based on follower count and analyze their videos"""
     qualified_influencers = []
     
-    with total=len(users), desc="Analyzing accounts") as pbar:
+    with tqdm(total=len(users), desc="Analyzing accounts") as pbar:
         for user_data in users:
             user = user_data["user"]
             username = user["uniqueId"]
@@ -1,41 +1,386 @@
-import os
 import argparse
+import asyncio
+import csv
+import functools
+import io
 import json
-import pandas as pd
+import operator
+import sqlite3
+import numpy as np
 import time
-import random
-import requests
+import threading
+import httpx
+from collections import Counter, deque
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from tqdm import tqdm
-import sys
+from tqdm.auto import tqdm
+
+try:
+    # Optional: stream-parse item_list responses instead of materializing them
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    # Optional: much faster JSON decoding for the number-heavy API responses
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: asyncio transport for the async fetch pipeline
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _json_dumps(obj):
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+MAX_CONCURRENT_FETCHES = 8
+
+# Upper bound on a creator's plausible avg-views-to-followers ratio. Small
+# accounts routinely average several times their follower count on the
+# FYP-driven feed, so only demands beyond this multiple are treated as
+# unreachable. Tune with --max_view_ratio; 0 disables the cut entirely.
+MAX_VIEW_RATIO = 10.0
+
+@dataclass
+class CandidatePool:
+    """Struct-of-arrays storage for search candidates.
+
+    Numeric fields live in parallel int64 arrays so the prefilter runs as
+    whole-array comparisons instead of per-dict lookups and boxed-int casts;
+    string fields stay as plain parallel lists.
+    """
+    sec_uid: list
+    username: list
+    nickname: list
+    bio: list
+    verified: np.ndarray
+    followers: np.ndarray
+    following: np.ndarray
+    videos: np.ndarray
+
+    @classmethod
+    def from_users(cls, users):
+        """Build parallel arrays from raw search_users rows"""
+        n = len(users)
+        return cls(
+            sec_uid=[u["user"]["secUid"] for u in users],
+            username=[u["user"]["uniqueId"] for u in users],
+            nickname=[u["user"].get("nickname", "") for u in users],
+            bio=[u["user"].get("signature", "") for u in users],
+            verified=np.fromiter((bool(u["user"].get("verified", False)) for u in users),
+                                 dtype=bool, count=n),
+            followers=np.fromiter((int(u["user"].get("followerCount", 0)) for u in users),
+                                  dtype=np.int64, count=n),
+            following=np.fromiter((int(u["user"].get("followingCount", 0)) for u in users),
+                                  dtype=np.int64, count=n),
+            videos=np.fromiter((int(u["user"].get("videoCount", 0)) for u in users),
+                               dtype=np.int64, count=n),
+        )
+
+    def __len__(self):
+        return len(self.sec_uid)
+
+    def subset(self, indices):
+        """New pool holding only the rows at the given indices"""
+        idx = list(indices)
+        return CandidatePool(
+            sec_uid=[self.sec_uid[i] for i in idx],
+            username=[self.username[i] for i in idx],
+            nickname=[self.nickname[i] for i in idx],
+            bio=[self.bio[i] for i in idx],
+            verified=self.verified[idx],
+            followers=self.followers[idx],
+            following=self.following[idx],
+            videos=self.videos[idx],
+        )
+
+def _prefilter_candidates(pool, max_followers, min_avg_views, max_view_ratio=MAX_VIEW_RATIO):
+    """Select the pool indices that could still qualify, without any HTTP calls.
+
+    All three cuts are whole-array comparisons: the follower cap, the minimum
+    video count (an average over fewer than 3 videos is meaningless), and an
+    engagement ceiling that rules out unverified accounts whose follower count
+    cannot plausibly reach min_avg_views (disabled when max_view_ratio is 0).
+    Rejects are tallied per reason for tuning max_view_ratio.
+    """
+    under_cap = pool.followers <= max_followers
+    enough_videos = pool.videos >= 3
+    if max_view_ratio > 0:
+        reachable = (pool.followers * max_view_ratio >= min_avg_views) | pool.verified
+    else:
+        reachable = np.ones(len(pool), dtype=bool)
+    keep = under_cap & enough_videos & reachable
+
+    rejects = Counter({
+        "over_max_followers": int(np.count_nonzero(~under_cap)),
+        "too_few_videos": int(np.count_nonzero(under_cap & ~enough_videos)),
+        "avg_views_unreachable": int(np.count_nonzero(under_cap & enough_videos & ~reachable)),
+    })
+    rejects = +rejects  # drop zero-count reasons
+    if rejects:
+        summary = ", ".join(f"{reason}: {n}" for reason, n in rejects.most_common())
+        print(f"Skipped {sum(rejects.values())} accounts without fetching ({summary})")
+
+    return np.nonzero(keep)[0]
+
+def _influencer_row(pool, i, avg_views, niche):
+    """Materialize the output dict for one qualified pool row"""
+    username = pool.username[i]
+    return {
+        "username": username,
+        "displayName": pool.nickname[i],
+        "bio": pool.bio[i],
+        "followerCount": int(pool.followers[i]),
+        "followingCount": int(pool.following[i]),
+        "videoCount": int(pool.videos[i]),
+        "avgViews": avg_views,
+        "verified": bool(pool.verified[i]),
+        "secUid": pool.sec_uid[i],
+        "niche": niche,
+        "profileUrl": f"https://www.tiktok.com/@{username}"
+    }
+
+class PersistentCache:
+    """SQLite-backed cache of API lookups shared across runs.
+
+    Repeat runs with overlapping keywords skip the HTTP round-trip entirely
+    for any user fetched within the freshness window.
+    """
+
+    def __init__(self, path="tiktok_cache.sqlite", ttl=86400):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            "key TEXT PRIMARY KEY, "
+            "fetched_at REAL NOT NULL, "
+            "payload BLOB NOT NULL)"
+        )
+
+    def get(self, key):
+        """Return the cached payload for key, or None if missing or stale"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM lookups WHERE key = ? AND fetched_at > ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        return _json_loads(row[0]) if row else None
+
+    def put(self, key, payload):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?)",
+                (key, time.time(), _json_dumps(payload))
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+class RateController:
+    """AIMD concurrency controller for the TikTok API calls.
+
+    The allowed number of in-flight requests grows additively while recent
+    latencies stay healthy and shrinks multiplicatively on 429/5xx responses,
+    so pacing adapts to what the server can sustain instead of fixed sleeps.
+    """
+
+    def __init__(self, c_start=2, alpha=0.5, beta=0.5, c_min=1, c_max=16,
+                 l_target=1.0, window=20, rpm_limit=120):
+        self.c = float(c_start)
+        self.alpha = alpha
+        self.beta = beta
+        self.c_min = c_min
+        self.c_max = c_max
+        self.l_target = l_target
+        self.rpm_limit = rpm_limit
+        self._latencies = deque(maxlen=window)
+        self._request_times = deque()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def pace_delay(self):
+        """Return how long to wait before the next request under the RPM budget.
+
+        No delay while the sliding-window request rate sits below 70% of the
+        budget; past that, the remaining window is spread over the remaining
+        request slots.
+        """
+        with self._cond:
+            now = time.monotonic()
+            while self._request_times and now - self._request_times[0] > 60.0:
+                self._request_times.popleft()
+            self._request_times.append(now)
+            used = len(self._request_times)
+            if used < self.rpm_limit * 0.7:
+                return 0.0
+            slots_remaining = max(self.rpm_limit - used, 1)
+            return max((self._request_times[0] + 60.0 - now) / slots_remaining, 0.0)
+
+    def pace(self):
+        """Block just long enough to stay under the RPM budget, if at all"""
+        delay = self.pace_delay()
+        if delay > 0:
+            time.sleep(delay)
+
+    def acquire(self):
+        """Block until an in-flight slot is available under the current limit"""
+        with self._cond:
+            while self._in_flight >= int(self.c):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def on_success(self, latency):
+        """Additively grow concurrency while latencies stay under target"""
+        with self._cond:
+            self._latencies.append(latency)
+            avg_latency = sum(self._latencies) / len(self._latencies)
+            if avg_latency <= self.l_target:
+                self.c = min(self.c + self.alpha, self.c_max)
+            else:
+                self.c = max(self.c * self.beta, self.c_min)
+            self._cond.notify_all()
+
+    def on_error(self):
+        """Multiplicatively back off after a throttle or server error"""
+        with self._cond:
+            self.c = max(self.c * self.beta, self.c_min)
+
 
 class TikTokAPI:
     """Simple TikTok API wrapper using the unofficial TikTok API endpoints"""
-    
-    def __init__(self, ms_token=None):
+
+    # Fixed query parameters shared by every endpoint
+    _BASE_PARAMS = {
+        "aid": "1988",
+        "app_name": "tiktok_web",
+        "device_platform": "web"
+    }
+
+    def __init__(self, ms_token=None, cache_path="tiktok_cache.sqlite", cache_ttl=86400):
         self.base_url = "https://www.tiktok.com/api"
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/103.0.0.0 Safari/537.36",
             "Referer": "https://www.tiktok.com/",
             "Cookie": f"msToken={ms_token}" if ms_token else ""
         }
-    
+
+        # One HTTP/2 client for every call: concurrent requests multiplex as
+        # streams over a couple of keep-alive TLS connections instead of each
+        # needing its own socket
+        self.client = httpx.Client(
+            http2=True,
+            headers=self.headers,
+            timeout=httpx.Timeout(15.0, connect=3.05),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            transport=httpx.HTTPTransport(retries=3)
+        )
+        self.controller = RateController()
+        self.cache = PersistentCache(cache_path, ttl=cache_ttl)
+
+        # Memoize per-user lookups so creators who surface under several
+        # keywords only cost one network round-trip each
+        self._fetch_user_info = functools.lru_cache(maxsize=4096)(self._fetch_user_info)
+        self._fetch_user_videos = functools.lru_cache(maxsize=4096)(self._fetch_user_videos)
+        self._fetch_play_counts = functools.lru_cache(maxsize=4096)(self._fetch_play_counts)
+
+    def _get(self, url, params, max_attempts=3):
+        """Issue one GET through the rate controller, feeding back latency and errors.
+
+        The request is sent in streaming mode so the status line and headers
+        are inspected first: the body is only downloaded on success, and error
+        responses (often full challenge HTML pages) are closed unread. 429/5xx
+        responses are retried up to max_attempts, honoring Retry-After between
+        attempts; connection errors retry on the transport.
+        """
+        for attempt in range(max_attempts):
+            self.controller.pace()
+            try:
+                with self.controller:
+                    start = time.monotonic()
+                    request = self.client.build_request("GET", url, params=params)
+                    response = self.client.send(request, stream=True)
+                    latency = time.monotonic() - start
+            except httpx.HTTPError:
+                self.controller.on_error()
+                raise
+
+            if response.is_success:
+                self.controller.on_success(latency)
+                # Proactively pause when the published rate-limit budget runs low
+                remaining = response.headers.get("x-ratelimit-remaining")
+                limit = response.headers.get("x-ratelimit-limit")
+                if remaining and limit:
+                    try:
+                        if int(remaining) < int(limit) * 0.1:
+                            time.sleep(1.0)
+                    except ValueError:
+                        pass
+                # Buffer the body for the caller
+                response.read()
+                return response
+
+            # Abort without downloading the error page
+            response.close()
+            if response.status_code == 429 or response.status_code >= 500:
+                self.controller.on_error()
+                # Honor the server's requested pause, then retry
+                try:
+                    retry_after = float(response.headers.get("Retry-After", 1))
+                except ValueError:
+                    retry_after = 1.0
+                time.sleep(retry_after)
+                if attempt < max_attempts - 1:
+                    continue
+
+            # Non-retryable status, or retries exhausted
+            response.raise_for_status()
+
+    def close(self):
+        """Close the underlying HTTP client and the on-disk cache"""
+        self.client.close()
+        self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def search_users(self, keyword, count=30, offset=0):
         """Search for users based on keyword"""
         try:
             url = f"{self.base_url}/search/user/full/"
-            params = {
-                "aid": "1988",
-                "app_name": "tiktok_web",
-                "device_platform": "web",
+            params = self._BASE_PARAMS | {
                 "keyword": keyword,
                 "count": count,
                 "cursor": offset
             }
             
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response = self._get(url, params)
+            data = _json_loads(response.content)
             
             if "userInfo" not in data or "user_list" not in data["userInfo"]:
                 print(f"Warning: Unexpected API response format for keyword '{keyword}'")
@@ -43,24 +388,21 @@ class TikTokAPI:
             
             return data["userInfo"]["user_list"]
         
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             print(f"Error searching for '{keyword}': {str(e)}")
             return []
     
     def get_user_info(self, username):
-        """Get detailed user information"""
+        """Get detailed user information (memoized per username)"""
+        return self._fetch_user_info(username)
+
+    def _fetch_user_info(self, username):
         try:
             url = f"{self.base_url}/user/detail/"
-            params = {
-                "aid": "1988",
-                "app_name": "tiktok_web",
-                "device_platform": "web",
-                "uniqueId": username
-            }
+            params = self._BASE_PARAMS | {"uniqueId": username}
             
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response = self._get(url, params)
+            data = _json_loads(response.content)
             
             if "userInfo" not in data:
                 print(f"Warning: Unable to fetch info for user '{username}'")
@@ -68,35 +410,222 @@ class TikTokAPI:
             
             return data["userInfo"]
         
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             print(f"Error getting info for '{username}': {str(e)}")
             return None
     
     def get_user_videos(self, sec_uid, count=30, cursor=0):
-        """Get user's videos"""
+        """Get user's videos (memoized per (sec_uid, count, cursor))"""
+        return self._fetch_user_videos(sec_uid, count, cursor)
+
+    def get_user_play_counts(self, sec_uid, count=30, cursor=0):
+        """Get playCount for a user's recent videos (memoized per (sec_uid, count, cursor))
+
+        When ijson is available the response is stream-parsed so only the
+        playCount integers are materialized, not the full video metadata.
+        """
+        return self._fetch_play_counts(sec_uid, count, cursor)
+
+    def _fetch_play_counts(self, sec_uid, count=30, cursor=0):
+        cache_key = f"play_counts:{sec_uid}:{count}:{cursor}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        url = f"{self.base_url}/post/item_list/"
+        params = self._BASE_PARAMS | {
+            "count": count,
+            "cursor": cursor,
+            "secUid": sec_uid,
+            "type": 1
+        }
+
+        if ijson is not None:
+            try:
+                response = self._get(url, params)
+                try:
+                    play_counts = [int(views) for views in ijson.items(
+                        io.BytesIO(response.content),
+                        "itemList.item.stats.playCount", use_float=True)]
+                    # Zero counts may be a soft failure (200 with no itemList,
+                    # e.g. {"statusCode": 10201}); let the buffered path below
+                    # tell the difference and warn instead of caching []
+                    if play_counts:
+                        self.cache.put(cache_key, play_counts)
+                        return play_counts
+                except (ijson.JSONError, ValueError):
+                    # Short error payloads trip the streaming parser; retry
+                    # below through the buffered path
+                    pass
+            except (httpx.HTTPError, ValueError) as e:
+                print(f"Error getting videos: {str(e)}")
+                return []
+
+        videos = self._fetch_user_videos(sec_uid, count, cursor)
+        play_counts = [int(video["stats"]["playCount"]) for video in videos]
+        if videos:
+            self.cache.put(cache_key, play_counts)
+        return play_counts
+
+    def _fetch_user_videos(self, sec_uid, count=30, cursor=0):
+        cache_key = f"videos:{sec_uid}:{count}:{cursor}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             url = f"{self.base_url}/post/item_list/"
-            params = {
-                "aid": "1988",
-                "app_name": "tiktok_web",
-                "device_platform": "web",
+            params = self._BASE_PARAMS | {
                 "count": count,
                 "cursor": cursor,
                 "secUid": sec_uid,
                 "type": 1
             }
             
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response = self._get(url, params)
+            data = _json_loads(response.content)
             
             if "itemList" not in data:
                 print(f"Warning: Unable to fetch videos for user with secUid '{sec_uid}'")
                 return []
             
+            self.cache.put(cache_key, data["itemList"])
             return data["itemList"]
         
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Error getting videos: {str(e)}")
+            return []
+
+class TikTokAsyncAPI:
+    """asyncio variant of TikTokAPI multiplexing calls over one aiohttp session.
+
+    One event loop drives all in-flight requests through a shared keep-alive
+    connector; an asyncio.Semaphore caps concurrency the same way the
+    threaded pipeline does. Use as 'async with TikTokAsyncAPI(...) as api:'.
+    """
+
+    _BASE_PARAMS = TikTokAPI._BASE_PARAMS
+
+    def __init__(self, ms_token=None, cache_path="tiktok_cache.sqlite",
+                 cache_ttl=86400, max_concurrency=MAX_CONCURRENT_FETCHES):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for TikTokAsyncAPI")
+        self.base_url = "https://www.tiktok.com/api"
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/103.0.0.0 Safari/537.36",
+            "Referer": "https://www.tiktok.com/",
+            "Cookie": f"msToken={ms_token}" if ms_token else ""
+        }
+        self.cache = PersistentCache(cache_path, ttl=cache_ttl)
+        self.controller = RateController()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.session = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            connector=aiohttp.TCPConnector(limit=20, limit_per_host=8,
+                                           ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=15, sock_connect=3.05)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.session.close()
+        self.cache.close()
+
+    async def _get_json(self, url, params, max_attempts=3):
+        """Fetch and decode one endpoint while holding a concurrency slot.
+
+        Mirrors TikTokAPI._get: 429/5xx responses feed the shared rate
+        controller and are retried up to max_attempts, honoring Retry-After
+        between attempts.
+        """
+        async with self.semaphore:
+            for attempt in range(max_attempts):
+                # Only waits when the sliding-window request rate nears the budget
+                delay = self.controller.pace_delay()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                try:
+                    start = time.monotonic()
+                    response = await self.session.get(url, params=params)
+                    latency = time.monotonic() - start
+                except aiohttp.ClientError:
+                    self.controller.on_error()
+                    raise
+
+                try:
+                    if response.status == 429 or response.status >= 500:
+                        self.controller.on_error()
+                        # Honor the server's requested pause, then retry
+                        try:
+                            retry_after = float(response.headers.get("Retry-After", 1))
+                        except ValueError:
+                            retry_after = 1.0
+                        await asyncio.sleep(retry_after)
+                        if attempt < max_attempts - 1:
+                            continue
+
+                    # Non-retryable status, or retries exhausted
+                    response.raise_for_status()
+                    body = await response.read()
+                finally:
+                    response.release()
+
+                self.controller.on_success(latency)
+                return _json_loads(body)
+
+    async def search_users(self, keyword, count=30, offset=0):
+        """Search for users based on keyword"""
+        try:
+            url = f"{self.base_url}/search/user/full/"
+            params = self._BASE_PARAMS | {
+                "keyword": keyword,
+                "count": count,
+                "cursor": offset
+            }
+
+            data = await self._get_json(url, params)
+
+            if "userInfo" not in data or "user_list" not in data["userInfo"]:
+                print(f"Warning: Unexpected API response format for keyword '{keyword}'")
+                return []
+
+            return data["userInfo"]["user_list"]
+
+        except (aiohttp.ClientError, ValueError) as e:
+            print(f"Error searching for '{keyword}': {str(e)}")
+            return []
+
+    async def get_user_play_counts(self, sec_uid, count=30, cursor=0):
+        """Get playCount for a user's recent videos"""
+        cache_key = f"play_counts:{sec_uid}:{count}:{cursor}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            url = f"{self.base_url}/post/item_list/"
+            params = self._BASE_PARAMS | {
+                "count": count,
+                "cursor": cursor,
+                "secUid": sec_uid,
+                "type": 1
+            }
+
+            data = await self._get_json(url, params)
+
+            if "itemList" not in data:
+                print(f"Warning: Unable to fetch videos for user with secUid '{sec_uid}'")
+                return []
+
+            play_counts = [int(video["stats"]["playCount"]) for video in data["itemList"]]
+            self.cache.put(cache_key, play_counts)
+            return play_counts
+
+        except (aiohttp.ClientError, ValueError) as e:
             print(f"Error getting videos: {str(e)}")
             return []
 
@@ -104,100 +633,195 @@ def search_influencers_by_keyword(api, keyword, max_results=100):
     """Search for influencers using a keyword"""
     print(f"Searching for '{keyword}' influencers...")
     
-    all_users = []
+    seen = set()
+    unique_users = {}
     offset = 0
     batch_size = 30  # TikTok API typically returns 30 results per page
-    
+
     with tqdm(total=max_results, desc=f"Finding {keyword} creators") as pbar:
-        while len(all_users) < max_results:
+        while len(unique_users) < max_results:
             users = api.search_users(keyword, count=batch_size, offset=offset)
-            
+
             if not users:
                 break
-                
-            all_users.extend(users)
-            pbar.update(len(users))
-            
+
+            # Dedup on secUid at insertion time; cursor pages often overlap
+            new_users = 0
+            for user in users:
+                sec_uid = user["user"]["secUid"]
+                if sec_uid in seen:
+                    continue
+                seen.add(sec_uid)
+                unique_users[sec_uid] = user
+                new_users += 1
+
+            pbar.update(new_users)
             offset += len(users)
-            
-            # Avoid rate limiting
-            time.sleep(random.uniform(1.0, 2.0))
-    
-    # Remove duplicates based on secUid
-    unique_users = {user["user"]["secUid"]: user for user in all_users}
-    
+
+            # A full page of duplicates means the results are exhausted
+            if new_users == 0:
+                break
+
     print(f"Found {len(unique_users)} unique accounts for '{keyword}'")
-    return list(unique_users.values())
+    return CandidatePool.from_users(list(unique_users.values()))
+
+# Output column order and CSV header names
+COLUMN_RENAME = {
+    "username": "Username",
+    "displayName": "Display Name",
+    "followerCount": "Followers",
+    "avgViews": "Avg Views",
+    "videoCount": "Videos",
+    "niche": "Niche",
+    "bio": "Bio",
+    "verified": "Verified",
+    "profileUrl": "Profile URL",
+    "secUid": "Sec UID"
+}
 
-def filter_influencers(api, users, max_followers=550000, min_avg_views=40000, niche=""):
-    """Filter influencers based on follower count and analyze their videos"""
+def filter_influencers(api, pool, max_followers=550000, min_avg_views=40000, niche="",
+                       max_view_ratio=MAX_VIEW_RATIO):
+    """Filter a candidate pool and analyze the survivors' videos"""
     qualified_influencers = []
-    
-    with tqdm(total=len(users), desc="Analyzing accounts") as pbar:
-        for user_data in users:
-            user = user_data["user"]
-            username = user["uniqueId"]
-            sec_uid = user["secUid"]
-            follower_count = int(user.get("followerCount", 0))
-            
-            # Check follower count
-            if follower_count > max_followers:
+
+    candidate_idxs = _prefilter_candidates(pool, max_followers, min_avg_views, max_view_ratio)
+
+    if candidate_idxs.size == 0:
+        return qualified_influencers
+
+    # The video fetches are network-bound, so run them concurrently through a
+    # bounded pool sharing the API's client (httpx.Client.get is thread-safe)
+    with tqdm(total=len(candidate_idxs), desc="Analyzing accounts") as pbar, \
+         ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as executor:
+        future_to_idx = {
+            executor.submit(api.get_user_play_counts, pool.sec_uid[i], 30): i
+            for i in candidate_idxs.tolist()
+        }
+
+        for future in as_completed(future_to_idx):
+            i = future_to_idx[future]
+            play_counts = future.result()
+
+            if not play_counts:
                 pbar.update(1)
                 continue
-            
-            # Get videos to analyze average views
-            videos = api.get_user_videos(sec_uid, count=30)
-            
-            if not videos:
+
+            # Calculate average views
+            avg_views = float(np.asarray(play_counts, dtype=np.int64).mean())
+
+            # Check minimum average views
+            if avg_views >= min_avg_views:
+                qualified_influencers.append(_influencer_row(pool, i, avg_views, niche))
+                print(f"Qualified: {pool.username[i]} - {int(pool.followers[i]):,} followers, {avg_views:,.2f} avg views")
+
+            pbar.update(1)
+
+    return qualified_influencers
+
+async def _analyze_user_async(api, pool, i):
+    """Fetch one candidate's play counts, keeping its pool index attached"""
+    play_counts = await api.get_user_play_counts(pool.sec_uid[i], count=30)
+    return i, play_counts
+
+async def filter_influencers_async(api, pool, max_followers=550000, min_avg_views=40000, niche="",
+                                   max_view_ratio=MAX_VIEW_RATIO):
+    """Async counterpart of filter_influencers sharing one event loop"""
+    qualified_influencers = []
+
+    candidate_idxs = _prefilter_candidates(pool, max_followers, min_avg_views, max_view_ratio)
+
+    if candidate_idxs.size == 0:
+        return qualified_influencers
+
+    tasks = [asyncio.ensure_future(_analyze_user_async(api, pool, i))
+             for i in candidate_idxs.tolist()]
+
+    with tqdm(total=len(candidate_idxs), desc="Analyzing accounts") as pbar:
+        for task in asyncio.as_completed(tasks):
+            i, play_counts = await task
+
+            if not play_counts:
                 pbar.update(1)
                 continue
-            
+
             # Calculate average views
-            total_views = sum(int(video["stats"]["playCount"]) for video in videos)
-            avg_views = total_views / len(videos)
-            
+            avg_views = float(np.asarray(play_counts, dtype=np.int64).mean())
+
             # Check minimum average views
             if avg_views >= min_avg_views:
-                influencer_data = {
-                    "username": username,
-                    "displayName": user.get("nickname", ""),
-                    "bio": user.get("signature", ""),
-                    "followerCount": follower_count,
-                    "followingCount": int(user.get("followingCount", 0)),
-                    "videoCount": int(user.get("videoCount", 0)),
-                    "avgViews": avg_views,
-                    "verified": user.get("verified", False),
-                    "secUid": sec_uid,
-                    "niche": niche,
-                    "profileUrl": f"https://www.tiktok.com/@{username}"
-                }
-                
-                qualified_influencers.append(influencer_data)
-                print(f"Qualified: {username} - {follower_count:,} followers, {avg_views:,.2f} avg views")
-            
+                qualified_influencers.append(_influencer_row(pool, i, avg_views, niche))
+                print(f"Qualified: {pool.username[i]} - {int(pool.followers[i]):,} followers, {avg_views:,.2f} avg views")
+
             pbar.update(1)
-            
-            # Avoid rate limiting
-            time.sleep(random.uniform(1.0, 2.0))
-    
+
     return qualified_influencers
 
-def find_tiktok_influencers(keywords, max_followers=550000, min_avg_views=40000, ms_token=None, results_per_keyword=50):
+async def find_tiktok_influencers_async(keywords, max_followers=550000, min_avg_views=40000, ms_token=None, results_per_keyword=50, cache_ttl=86400, max_view_ratio=MAX_VIEW_RATIO):
+    """Async counterpart of find_tiktok_influencers built on TikTokAsyncAPI"""
+    all_influencers = []
+    seen_sec_uids = set()
+
+    async with TikTokAsyncAPI(ms_token, cache_ttl=cache_ttl) as api:
+        for keyword in keywords:
+            print(f"\nSearching for influencers in the '{keyword}' niche...")
+
+            # Paginate the keyword search, deduping on secUid as pages arrive
+            unique_users = {}
+            offset = 0
+            while len(unique_users) < results_per_keyword:
+                page = await api.search_users(keyword, count=30, offset=offset)
+                if not page:
+                    break
+                new_users = 0
+                for user in page:
+                    sec_uid = user["user"]["secUid"]
+                    if sec_uid not in unique_users:
+                        unique_users[sec_uid] = user
+                        new_users += 1
+                offset += len(page)
+                if new_users == 0:
+                    break
+
+            pool = CandidatePool.from_users(list(unique_users.values()))
+
+            # Skip creators already analyzed under an earlier keyword
+            fresh = [i for i, sid in enumerate(pool.sec_uid) if sid not in seen_sec_uids]
+            seen_sec_uids.update(pool.sec_uid)
+            pool = pool.subset(fresh)
+
+            qualified = await filter_influencers_async(api, pool, max_followers, min_avg_views,
+                                                       keyword, max_view_ratio)
+            all_influencers.extend(qualified)
+
+            print(f"Found {len(qualified)} qualified influencers for '{keyword}'")
+
+    # Remove duplicates based on username
+    unique_influencers = {inf["username"]: inf for inf in all_influencers}
+    return list(unique_influencers.values())
+
+def find_tiktok_influencers(keywords, max_followers=550000, min_avg_views=40000, ms_token=None, results_per_keyword=50, cache_ttl=86400, max_view_ratio=MAX_VIEW_RATIO):
     """Find TikTok influencers matching criteria across multiple keywords"""
-    api = TikTokAPI(ms_token)
     all_influencers = []
-    
-    for keyword in keywords:
-        print(f"\nSearching for influencers in the '{keyword}' niche...")
-        
-        # Search for users related to the keyword
-        users = search_influencers_by_keyword(api, keyword, max_results=results_per_keyword)
-        
-        # Filter and analyze the users
-        qualified = filter_influencers(api, users, max_followers, min_avg_views, keyword)
-        all_influencers.extend(qualified)
-        
-        print(f"Found {len(qualified)} qualified influencers for '{keyword}'")
+    seen_sec_uids = set()
+
+    with TikTokAPI(ms_token, cache_ttl=cache_ttl) as api:
+        for keyword in keywords:
+            print(f"\nSearching for influencers in the '{keyword}' niche...")
+
+            # Search for users related to the keyword
+            pool = search_influencers_by_keyword(api, keyword, max_results=results_per_keyword)
+
+            # Skip creators already analyzed under an earlier keyword
+            fresh = [i for i, sid in enumerate(pool.sec_uid) if sid not in seen_sec_uids]
+            seen_sec_uids.update(pool.sec_uid)
+            pool = pool.subset(fresh)
+
+            # Filter and analyze the candidates
+            qualified = filter_influencers(api, pool, max_followers, min_avg_views, keyword,
+                                           max_view_ratio)
+            all_influencers.extend(qualified)
+
+            print(f"Found {len(qualified)} qualified influencers for '{keyword}'")
     
     # Remove duplicates based on username
     unique_influencers = {inf["username"]: inf for inf in all_influencers}
@@ -217,6 +841,13 @@ def main():
                        help='TikTok msToken for API access (optional)')
     parser.add_argument('--results_per_keyword', type=int, default=50,
                        help='Maximum number of results to process per keyword')
+    parser.add_argument('--cache_ttl', type=int, default=86400,
+                       help='Seconds to reuse cached API lookups across runs')
+    parser.add_argument('--max_view_ratio', type=float, default=MAX_VIEW_RATIO,
+                       help='Avg-views-to-followers ceiling used to skip fetches '
+                            'for accounts that cannot reach min_avg_views (0 disables)')
+    parser.add_argument('--use_async', action='store_true',
+                       help='Run the fetch pipeline on asyncio/aiohttp instead of threads')
     
     args = parser.parse_args()
     
@@ -227,75 +858,68 @@ def main():
     print("=======================\n")
     
     try:
-        qualified_influencers = find_tiktok_influencers(
+        finder_args = (
             args.keywords,
             args.max_followers,
             args.min_avg_views,
             args.ms_token,
-            args.results_per_keyword
+            args.results_per_keyword,
+            args.cache_ttl,
+            args.max_view_ratio
         )
+        if args.use_async:
+            qualified_influencers = asyncio.run(find_tiktok_influencers_async(*finder_args))
+        else:
+            qualified_influencers = find_tiktok_influencers(*finder_args)
         
         if not qualified_influencers:
             print("No influencers found matching the criteria.")
             return
         
-        # Create DataFrame and save to CSV
-        df = pd.DataFrame(qualified_influencers)
-        df = df.sort_values(by="avgViews", ascending=False)
-        
-        # Rearrange columns for output
-        columns = [
-            "username", "displayName", "followerCount", "avgViews", 
-            "videoCount", "niche", "bio", "verified", "profileUrl", "secUid"
-        ]
-        df_output = df[columns]
-        
-        # Rename columns for better readability
-        column_names = {
-            "username": "Username",
-            "displayName": "Display Name",
-            "followerCount": "Followers",
-            "avgViews": "Avg Views",
-            "videoCount": "Videos",
-            "niche": "Niche",
-            "bio": "Bio",
-            "verified": "Verified",
-            "profileUrl": "Profile URL",
-            "secUid": "Sec UID"
-        }
-        df_output = df_output.rename(columns=column_names)
-        
-        df_output.to_csv(args.output, index=False)
+        # Sort by average views and save to CSV
+        qualified_influencers.sort(key=operator.itemgetter("avgViews"), reverse=True)
+
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(COLUMN_RENAME.values()))
+            writer.writeheader()
+            writer.writerows(
+                {header: inf[field] for field, header in COLUMN_RENAME.items()}
+                for inf in qualified_influencers
+            )
         print(f"\nFound {len(qualified_influencers)} matching influencers. Results saved to {args.output}")
         
-        # Also save a pretty summary to text file
+        # Also save a pretty summary to text file; build all lines up front
+        # and write them in one call instead of ~10 f.write calls per entry
         txt_output = args.output.replace('.csv', '.txt')
-        with open(txt_output, 'w', encoding='utf-8') as f:
-            f.write("TikTok Influencer Finder Results\n")
-            f.write("===============================\n\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Search Keywords: {', '.join(args.keywords)}\n")
-            f.write(f"Criteria: Under {args.max_followers:,} followers, with at least {args.min_avg_views:,} average views per video\n\n")
-            f.write(f"Found {len(qualified_influencers)} matching influencers:\n\n")
-            
-            for i, inf in enumerate(qualified_influencers, 1):
-                f.write(f"{i}. @{inf['username']} ({inf['displayName']})\n")
-                f.write(f"   Followers: {inf['followerCount']:,}\n")
-                f.write(f"   Avg Views: {inf['avgViews']:,.2f}\n")
-                f.write(f"   Videos: {inf['videoCount']}\n")
-                f.write(f"   Niche: {inf['niche']}\n")
-                f.write(f"   Verified: {'Yes' if inf['verified'] else 'No'}\n")
-                f.write(f"   Profile: {inf['profileUrl']}\n")
-                
-                # Split bio into lines if too long
-                bio = inf['bio'].strip()
-                if bio:
-                    if len(bio) > 70:
-                        f.write(f"   Bio: {bio[:70]}...\n")
-                    else:
-                        f.write(f"   Bio: {bio}\n")
-                
-                f.write("\n")
+        lines = [
+            "TikTok Influencer Finder Results\n",
+            "===============================\n\n",
+            f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"Search Keywords: {', '.join(args.keywords)}\n",
+            f"Criteria: Under {args.max_followers:,} followers, with at least {args.min_avg_views:,} average views per video\n\n",
+            f"Found {len(qualified_influencers)} matching influencers:\n\n",
+        ]
+
+        for i, inf in enumerate(qualified_influencers, 1):
+            lines.append(
+                f"{i}. @{inf['username']} ({inf['displayName']})\n"
+                f"   Followers: {inf['followerCount']:,}\n"
+                f"   Avg Views: {inf['avgViews']:,.2f}\n"
+                f"   Videos: {inf['videoCount']}\n"
+                f"   Niche: {inf['niche']}\n"
+                f"   Verified: {'Yes' if inf['verified'] else 'No'}\n"
+                f"   Profile: {inf['profileUrl']}\n"
+            )
+
+            # Truncate the bio if too long
+            bio = inf['bio'].strip()
+            if bio:
+                lines.append(f"   Bio: {bio[:70]}{'...' if len(bio) > 70 else ''}\n")
+
+            lines.append("\n")
+
+        with open(txt_output, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(''.join(lines))
         
         print(f"A detailed summary is also available at {txt_output}")
         